@@ -76,21 +76,31 @@ class Experiment(luigi.Task):
     settings = luigi.DictParameter()
 
     def requires(self):
+        # blank lines are skipped, and a level1 listed more than once
+        # is only parsed once
         with open(self.level1_list) as src:
-            level1_paths = [level1_path.strip() for level1_path in src.readlines()]
+            level1_paths = dict.fromkeys(line.strip() for line in src)
+            level1_paths.pop("", None)
 
         def worker(level1_path):
+            # returns a list rather than yielding, so that the parsing
+            # happens in the executor's threads
+            result = []
             for granule in preliminary_acquisitions_data(
                 level1_path, self.acq_parser_hint
             ):
                 work_root = pjoin(self.workdir, self.tag, basename(level1_path))
                 work_dir = pjoin(work_root, granule["id"])
-                yield {
-                    "kind": "leaf",
-                    "level1_path": level1_path,
-                    "workdir": work_dir,
-                    "granule": granule["id"],
-                }
+                result.append(
+                    {
+                        "kind": "leaf",
+                        "level1_path": level1_path,
+                        "workdir": work_dir,
+                        "granule": granule["id"],
+                    }
+                )
+
+            return result
 
         # collect file info concurrently since IO is expensive
         executor = ThreadPoolExecutor()
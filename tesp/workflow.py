@@ -409,6 +409,10 @@ class Package(luigi.Task):
                 dataset_path=str(md_path),
             )
 
+        # the packaged outputs are written, so the work directory can go;
+        # removed before the completion target is written, so that an
+        # interrupted removal leaves the task incomplete rather than
+        # leaving a partly deleted tree behind a completed task
         if self.cleanup:
             shutil.rmtree(self.workdir)
 
@@ -471,18 +475,25 @@ class ARDP(luigi.WrapperTask):
     yamls_dir: str = luigi.OptionalParameter(default="")
 
     def requires(self):
-        with open(self.level1_list) as src:
-            level1_list = [level1.strip() for level1 in src.readlines()]
-
         worker = list_packages(
             self.workdir, self.acq_parser_hint, self.pkgdir, self.yamls_dir
         )
 
-        executor = ThreadPoolExecutor()
-        futures = [executor.submit(worker, level1) for level1 in level1_list]
-
-        for future in as_completed(futures):
-            yield from future.result()
+        with ThreadPoolExecutor() as executor:
+            # submit each level1 as it is read, rather than reading the
+            # whole list up front; blank lines are skipped, and a level1
+            # listed more than once is only parsed once
+            futures = []
+            submitted = set()
+            with open(self.level1_list) as src:
+                for line in src:
+                    level1 = line.strip()
+                    if level1 and level1 not in submitted:
+                        submitted.add(level1)
+                        futures.append(executor.submit(worker, level1))
+
+            for future in as_completed(futures):
+                yield from future.result()
 
 
 if __name__ == "__main__":
@@ -199,6 +199,15 @@ class Landsat5Scene1AcquisitionTest(unittest.TestCase):
     def test_read(self):
         assert self.acqs[0].data()[40, 30] == 53
 
+    def test_read_keep_open(self):
+        acq = self.acqs[0]
+        window = ((40, 41), (30, 31))
+        with acq.keep_open():
+            assert acq.data(window=window)[0, 0] == 53
+            assert acq.data_and_box(window=window)[0][0, 0] == 53
+        assert acq._ds is None
+        assert acq.data(window=window)[0, 0] == 53
+
     def test_spectral_filter_cfg_vsir(self):
         assert self.acqs[0].spectral_filter_name == "landsat5_vsir.flt"
 
@@ -260,6 +260,17 @@ class TestGriddedGeoBox(unittest.TestCase):
             new_geobox = GriddedGeoBox.from_h5_dataset(ds)
             assert new_geobox.shape == img.shape
 
+    def test_subset(self):
+        """Test that a windowed subset is located on the parent grid."""
+        _, geobox = ut.create_test_image()
+        window = ((10, 30), (5, 25))
+        subset = geobox.subset(window)
+
+        assert subset.shape == (20, 20)
+        assert subset.origin == geobox.convert_coordinates((5, 10))
+        assert subset.pixelsize == geobox.pixelsize
+        assert subset.crs.ExportToWkt() == geobox.crs.ExportToWkt()
+
     def test_convert_coordinate_to_map(self):
         """Test that an input image/array co-ordinate is correctly
         converted to a map co-cordinate.
@@ -1,4 +1,7 @@
 import datetime
+import os
+import shutil
+import tempfile
 import unittest
 from os.path import abspath, dirname
 from os.path import join as pjoin
@@ -215,5 +218,42 @@ class Landsat8MTL2ParserTest(unittest.TestCase):
         assert "PROJECTION_PARAMETERS" in tree
 
 
+class LoadMtlCacheTest(unittest.TestCase):
+    """Test the caching of parsed MTL files."""
+
+    def setUp(self):
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        self.fname = pjoin(tmpdir, "L5_MTL.txt")
+        shutil.copy(L5_MTL1, self.fname)
+
+    def test_modified_file_reparsed(self):
+        tree = load_mtl(self.fname)
+        assert "PRODUCT_METADATA" in tree
+
+        with open(self.fname) as src:
+            data = src.read().replace("PRODUCT_METADATA", "PRODUCT_INFO")
+
+        with open(self.fname, "w") as src:
+            src.write(data)
+
+        # ensure the modification time differs from the cached entry
+        mtime = os.path.getmtime(self.fname) + 10
+        os.utime(self.fname, (mtime, mtime))
+
+        tree = load_mtl(self.fname)
+        assert "PRODUCT_INFO" in tree
+        assert "PRODUCT_METADATA" not in tree
+
+    def test_result_isolated_from_cache(self):
+        tree = load_mtl(self.fname)
+        tree["PRODUCT_METADATA"]["spacecraft_id"] = "modified"
+        del tree["METADATA_FILE_INFO"]
+
+        tree = load_mtl(self.fname)
+        assert tree["PRODUCT_METADATA"]["spacecraft_id"] == "Landsat5"
+        assert "METADATA_FILE_INFO" in tree
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+"""Unit tests for the temperature routines."""
+
+import unittest
+
+import numexpr
+import numpy as np
+
+from wagl.temperature import (
+    NO_DATA_VALUE,
+    SBT_ADD_OFFSET,
+    SBT_EXPRESSION,
+    SBT_SCALE_FACTOR,
+    SBT_SCALED_NO_DATA_VALUE,
+    scale_temperature,
+)
+
+
+class ScaleTemperatureTest(unittest.TestCase):
+    """Unit tests for the scale_temperature function."""
+
+    def test_round_trip(self):
+        """Scaled values decode to within half a scale step."""
+        temperature = np.linspace(180, 340, 1001, dtype="float32")
+        scaled = scale_temperature(temperature)
+
+        self.assertEqual(scaled.dtype, np.int16)
+        decoded = scaled * SBT_SCALE_FACTOR + SBT_ADD_OFFSET
+        self.assertTrue(np.all(np.abs(decoded - temperature) <= 0.0051))
+
+    def test_no_data(self):
+        """No data pixels map to the scaled no data value."""
+        temperature = np.array([[NO_DATA_VALUE, 300.0]], dtype="float32")
+        scaled = scale_temperature(temperature)
+
+        self.assertEqual(scaled[0, 0], SBT_SCALED_NO_DATA_VALUE)
+        self.assertEqual(scaled[0, 1], 2685)
+
+    def test_clipped(self):
+        """Out of range values saturate rather than wrap, and never
+        collide with the no data value.
+        """
+        temperature = np.array([1000.0, -500.0], dtype="float32")
+        scaled = scale_temperature(temperature)
+
+        self.assertEqual(scaled[0], np.iinfo("int16").max)
+        self.assertEqual(scaled[1], SBT_SCALED_NO_DATA_VALUE + 1)
+
+
+class SBTExpressionTest(unittest.TestCase):
+    """Unit tests for the brightness temperature expression."""
+
+    k1 = np.float32(607.76)
+    k2 = np.float32(1260.56)
+    fillvalue = np.float32(NO_DATA_VALUE)
+
+    def evaluate(self, radiance, path_up, trans):
+        """Evaluate SBT_EXPRESSION as surface_brightness_temperature does."""
+        local_dict = {
+            "radiance": radiance,
+            "path_up": path_up,
+            "trans": trans,
+            "finite": np.isfinite(trans),
+            "k1": self.k1,
+            "k2": self.k2,
+            "fillvalue": self.fillvalue,
+        }
+        return numexpr.evaluate(SBT_EXPRESSION, local_dict=local_dict)
+
+    def test_temperature(self):
+        """Valid pixels match the inverted Planck function."""
+        radiance = np.array([9.0, 10.0, 11.0], dtype="float32")
+        path_up = np.array([1.0, 1.5, 2.0], dtype="float32")
+        trans = np.array([0.8, 0.85, 0.9], dtype="float32")
+        result = self.evaluate(radiance, path_up, trans)
+
+        expected = self.k2 / np.log(1 + self.k1 / ((radiance - path_up) / trans))
+        self.assertEqual(result.dtype, np.float32)
+        np.testing.assert_allclose(result, expected, rtol=1e-6)
+
+    def test_invalid(self):
+        """Non-finite transmittance and non-positive corrected radiance
+        are set to the fill value.
+        """
+        radiance = np.array([9.0, 9.0, 9.0, 1.0, 0.5], dtype="float32")
+        path_up = np.ones(5, dtype="float32")
+        trans = np.array([np.nan, np.inf, -np.inf, 0.8, 0.8], dtype="float32")
+        result = self.evaluate(radiance, path_up, trans)
+
+        np.testing.assert_array_equal(result, NO_DATA_VALUE)
+
+
+if __name__ == "__main__":
+    unittest.main()
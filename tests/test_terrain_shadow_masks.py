@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""Unit tests for the self shadow mask."""
+
+import unittest
+
+import h5py
+import numpy as np
+
+from wagl import unittesting_tools as ut
+from wagl.constants import DatasetName, GroupName
+from wagl.terrain_shadow_masks import self_shadow
+
+
+class SelfShadowTest(unittest.TestCase):
+    """Unit tests for the self_shadow function."""
+
+    def setUp(self):
+        self.fid = h5py.File("tmp.h5", "w", driver="core", backing_store=False)
+        self.addCleanup(self.fid.close)
+
+    def _self_shadow(self, incident, exiting):
+        """Run self_shadow over the supplied angle arrays."""
+        _, geobox = ut.create_test_image(dimensions=incident.shape)
+        attrs = {
+            "geotransform": geobox.transform.to_gdal(),
+            "crs_wkt": geobox.crs.ExportToWkt(),
+        }
+
+        for name, data in (
+            (DatasetName.INCIDENT.value, incident),
+            (DatasetName.EXITING.value, exiting),
+        ):
+            dset = self.fid.create_dataset(name, data=data, chunks=data.shape)
+            dset.attrs.update(attrs)
+
+        self_shadow(self.fid, self.fid, out_group=self.fid)
+        grp = self.fid[GroupName.SHADOW_GROUP.value]
+
+        return grp[DatasetName.SELF_SHADOW.value][:]
+
+    def test_shadowed(self):
+        """Angles at or beyond 90 degrees are shadowed."""
+        incident = np.array([[10, 95, 10, 90]], dtype="float32")
+        exiting = np.array([[10, 10, 95, 10]], dtype="float32")
+        mask = self._self_shadow(incident, exiting)
+
+        np.testing.assert_array_equal(mask, [[True, False, False, False]])
+
+    def test_null_angles(self):
+        """Null (NaN) angles are not marked as shadowed."""
+        incident = np.array([[np.nan, 10, np.nan, 95]], dtype="float32")
+        exiting = np.array([[10, np.nan, np.nan, np.nan]], dtype="float32")
+        mask = self._self_shadow(incident, exiting)
+
+        np.testing.assert_array_equal(mask, [[True, True, True, False]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import datetime
-from functools import total_ordering
+from contextlib import contextmanager
+from functools import lru_cache, total_ordering
 from os.path import join as pjoin
 from typing import Dict, List
 
@@ -28,6 +29,15 @@ from ..tiling import generate_tiles
 ResolutionGroups = Dict[str, List["Acquisition"]]
 
 
+@lru_cache(maxsize=64)
+def _spectral_response(fname, spectral_range):
+    """Read (once) the spectral response filter file of a sensor.
+    The same filter is consumed for every MODTRAN point and albedo.
+    """
+    with open(fname) as fd:
+        return read_spectral_response(fd, spectral_range)
+
+
 def set_utc(acq_dt: datetime.datetime) -> datetime.datetime:
     """Check the timezone and convert to UTC if either no timezone
     exists, or if the acquisition datetime is not in UTC.
@@ -58,6 +68,8 @@ class AcquisitionsContainer:
         self._granules = granules
         #: In practice, usually the name of the input dataset file/tar.
         self._label = label
+        #: Supported acquisitions, keyed by (granule, group); populated lazily.
+        self._supported_acqs: dict[tuple[str, str], list[Acquisition]] = {}
 
     def __repr__(self):
         fmt = (
@@ -106,18 +118,27 @@ class AcquisitionsContainer:
         :return:
             A `list` of `Acquisition` objects.
         """
+        if granule is None:
+            granule = self.granules[0]
+
         groups = self.get_granule(granule=granule)
         if group is None:
-            acqs = groups[next(iter(groups.keys()))]
-        else:
-            acqs = groups[group]
+            group = next(iter(groups.keys()))
+
+        acqs = groups[group]
 
-        if only_supported_bands:
-            return list(
+        if not only_supported_bands:
+            return acqs
+
+        # the granules are fixed once the container is built, so the
+        # filtered selection is computed once and a copy handed out
+        key = (granule, group)
+        if key not in self._supported_acqs:
+            self._supported_acqs[key] = list(
                 filter(lambda acq: getattr(acq, "supported_band", False) is True, acqs)
             )
-        else:
-            return acqs
+
+        return list(self._supported_acqs[key])
 
     def get_granule(
         self, granule=None, container=False
@@ -281,6 +302,10 @@ class Acquisition:
 
         self._gps_file = False
 
+        # rasterio handle held open by `keep_open`; reads otherwise
+        # open (and close) the dataset per call
+        self._ds = None
+
         if metadata is not None:
             for key, value in metadata.items():
                 if key == "band_type":
@@ -301,6 +326,41 @@ class Acquisition:
             self._gridded_geo_box = GriddedGeoBox.from_dataset(ds)
             self._no_data_val = ds.nodatavals[0]
 
+    @contextmanager
+    def _dataset(self):
+        """Yield the rasterio dataset for this acquisition; the handle
+        held open by `keep_open` if there is one, otherwise the dataset
+        is opened for the duration of the context.
+        """
+        if self._ds is not None:
+            yield self._ds
+        else:
+            with rasterio.open(self.uri) as ds:
+                yield ds
+
+    @contextmanager
+    def keep_open(self):
+        """Hold the underlying dataset open for the duration of the
+        context, so that repeated (e.g. tiled) reads reuse a single
+        handle rather than re-opening the file for every read.
+        """
+        if self._ds is not None:
+            yield self
+            return
+
+        self._ds = rasterio.open(self.uri, sharing=False)
+        try:
+            yield self
+        finally:
+            self._ds.close()
+            self._ds = None
+
+    def __getstate__(self):
+        # open dataset handles can't be pickled; reopen on demand
+        state = self.__dict__.copy()
+        state["_ds"] = None
+        return state
+
     @property
     def pathname(self):
         """The pathname of the level1 dataset."""
@@ -395,10 +455,8 @@ class Acquisition:
         If `out` is supplied, it must be a numpy.array into which
         the Acquisition's data will be read.
         """
-        with rasterio.open(self.uri) as ds:
-            data = ds.read(1, out=out, window=window, masked=masked)
-
-        return data
+        with self._dataset() as ds:
+            return ds.read(1, out=out, window=window, masked=masked)
 
     def radiance_data(self, window=None, out_no_data=-999, esun=None):
         """Return the data as radiance in watts/(m^2*micrometre).
@@ -413,19 +471,11 @@ class Acquisition:
         the Acquisition's data will be read.
         for this acquisition.
         """
-        with rasterio.open(self.uri) as ds:
-            box = GriddedGeoBox.from_dataset(ds)
-            if window is not None:
-                rows = window[0][1] - window[0][0]
-                cols = window[1][1] - window[1][0]
-                prj = ds.crs.wkt
-                res = ds.res
-
-                # Get the new UL co-ordinates of the array
-                ul_x, ul_y = ds.transform * (window[1][0], window[0][0])
-                box = GriddedGeoBox(
-                    shape=(rows, cols), origin=(ul_x, ul_y), pixelsize=res, crs=prj
-                )
+        # the geobox is computed once in `_open`; a window is a subset of it
+        box = self._gridded_geo_box
+        if window is not None:
+            box = box.subset(window)
+        with self._dataset() as ds:
             return (ds.read(1, out=out, window=window, masked=masked), box)
 
     def gridded_geo_box(self):
@@ -455,8 +505,8 @@ class Acquisition:
     def spectral_response(self, as_list=False):
         """Reads the spectral response for the sensor."""
         spectral_range = range(*self.spectral_range)
-        with open(self.spectral_filter_filepath) as fd:
-            return read_spectral_response(fd, spectral_range)
+        response = _spectral_response(self.spectral_filter_filepath, spectral_range)
+        return response.copy()
 
     def close(self):
         """A simple additional utility for acquisitions that need
@@ -1,7 +1,5 @@
 """Acquisitions for WorldView-2 satellite."""
 
-import rasterio
-
 from .base import Acquisition
 
 
@@ -75,10 +73,8 @@ class WorldView2MultiAcquisition(WorldView2Acquisition):
         If `out` is supplied, it must be a numpy.array into which
         the Acquisition's data will be read.
         """
-        with rasterio.open(self.uri) as ds:
-            data = ds.read(int(self.band_id), out=out, window=window, masked=masked)
-
-        return data
+        with self._dataset() as ds:
+            return ds.read(int(self.band_id), out=out, window=window, masked=masked)
 
     def radiance_data(self, window=None, out_no_data=-999, esun=None):
         """Return the data as radiance in watts/(m^2*micrometre)."""
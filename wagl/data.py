@@ -3,6 +3,7 @@
 """
 
 import logging
+import os
 import subprocess
 import tempfile
 from os.path import basename, dirname
@@ -24,6 +25,13 @@ from wagl.tiling import generate_tiles
 _LOG = logging.getLogger(__name__)
 
 
+def available_cpus():
+    """The number of CPUs available to the current process."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
 def get_pixel(h5_path: str, dataset_name: str, lonlat: Tuple[float, float]):
     """Return a pixel from `filename` at the longitude and latitude given
     by the tuple `lonlat`. Optionally, the `band` can be specified.
@@ -535,6 +543,7 @@ def reproject_array_to_array(
     src_nodata=None,
     dst_nodata=None,
     resampling=Resampling.nearest,
+    num_threads=1,
 ):
     """Reprojects an image/array to the desired co-ordinate reference system.
 
@@ -561,6 +570,10 @@ def reproject_array_to_array(
         check rasterio.warp.RESMPLING for more details.
         Default is 0, nearest neighbour resampling.
 
+    :param num_threads:
+        The number of worker threads GDAL uses for the warp.
+        Default is 1.
+
     :return:
         A NumPy array containing the reprojected result.
     """
@@ -595,6 +608,7 @@ def reproject_array_to_array(
         dst_crs=dst_prj,
         dst_nodata=dst_nodata,
         resampling=resampling,
+        num_threads=num_threads,
     )
 
     return dst_arr
@@ -8,7 +8,7 @@ from rasterio.warp import Resampling
 from scipy import ndimage
 
 from wagl.constants import DatasetName, GroupName
-from wagl.data import read_subset, reproject_array_to_array
+from wagl.data import available_cpus, read_subset, reproject_array_to_array
 from wagl.geobox import GriddedGeoBox
 from wagl.hdf5 import VLEN_STRING, H5CompressionFilter, attach_image_attributes
 from wagl.margins import pixel_buffer
@@ -50,6 +50,7 @@ def get_dsm(
     out_group=None,
     compression=H5CompressionFilter.LZF,
     filter_opts=None,
+    num_threads=1,
 ):
     """Given an acquisition and a national Digitial Surface Model,
     extract a subset from the DSM based on the acquisition extents
@@ -92,6 +93,11 @@ def get_dsm(
         Default is None, which will use the default settings for the
         chosen H5CompressionFilter instance.
 
+    :param num_threads:
+        The number of worker threads GDAL uses to warp the DSM.
+        Default is 1. A value of 0 uses the number of CPUs available
+        to the current process.
+
     :return:
         An opened `h5py.File` object, that is either in-memory using the
         `core` driver, or on disk.
@@ -158,7 +164,11 @@ def get_dsm(
 
     # Retrive the DSM data
     dsm_data = reproject_array_to_array(
-        subs, subs_geobox, dem_geobox, resampling=Resampling.bilinear
+        subs,
+        subs_geobox,
+        dem_geobox,
+        resampling=Resampling.bilinear,
+        num_threads=num_threads or available_cpus(),
     )
 
     # free memory
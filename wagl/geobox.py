@@ -250,6 +250,23 @@ class GriddedGeoBox:
 
         return GriddedGeoBox(self.shape, newOrigin, newPixelSize, crs=crs)
 
+    def subset(self, window):
+        """Return the GriddedGeoBox covering a window of this
+        GriddedGeoBox. The CRS is cloned rather than re-parsed.
+
+        :param window:
+            A pair of range tuples defining the rectangular subset
+            ((row_start, row_stop), (col_start, col_stop)).
+
+        :return:
+            A GriddedGeoBox sharing this GriddedGeoBox's grid.
+        """
+        (row_start, row_stop), (col_start, col_stop) = window
+        shape = (row_stop - row_start, col_stop - col_start)
+        origin = self.transform * (col_start, row_start)
+
+        return GriddedGeoBox(shape, origin, self.pixelsize, crs=self.crs.Clone())
+
     def __repr__(self):
         fmt = (
             "GriddedGeoBox:\n*\torigin: {origin}\n*\tshape: {shape}\n*\t"
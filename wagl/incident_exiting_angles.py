@@ -2,6 +2,7 @@
 
 """Calculates 2D grids of incident, exiting and relative azimuthal angles."""
 
+import numexpr
 import numpy as np
 
 from wagl.__exiting_angle import exiting_angle as exiting_angle_prim
@@ -420,10 +421,12 @@ def relative_azimuth_slope(
         azi_inc = azimuth_incident_dataset[idx]
         azi_exi = azimuth_exiting_dataset[idx]
 
-        # Process the tile
-        rel_azi = azi_inc - azi_exi
-        rel_azi[rel_azi <= -180.0] += 360.0
-        rel_azi[rel_azi > 180.0] -= 360.0
+        # Process the tile; wrap the difference into the (-180, 180] range
+        rel_azi = numexpr.evaluate(
+            "where(inc - exi <= -180, inc - exi + 360, "
+            "where(inc - exi > 180, inc - exi - 360, inc - exi))",
+            local_dict={"inc": azi_inc, "exi": azi_exi},
+        )
 
         # Write the current tile to disk
         out_dset[idx] = rel_azi
@@ -392,11 +392,42 @@ def interpolate(
 ):
     # TODO: more docstrings
     """Perform interpolation."""
+    interpolate_batch(
+        [acq],
+        coefficient,
+        ancillary_group,
+        satellite_solar_group,
+        coefficients_group,
+        out_group,
+        compression,
+        filter_opts,
+        method,
+    )
+
+
+def interpolate_batch(
+    acqs,
+    coefficient,
+    ancillary_group,
+    satellite_solar_group,
+    coefficients_group,
+    out_group=None,
+    compression=H5CompressionFilter.LZF,
+    filter_opts=None,
+    method=Method.SHEARB,
+):
+    """Perform interpolation of a single coefficient for several bands.
+
+    Equivalent to calling :py:func:`interpolate` for each acquisition,
+    but the coordinator, boxline and coefficients tables are only read
+    once. All acquisitions must share the same grid, i.e. belong to the
+    same resolution group.
+    """
     if method not in Method:
         msg = "Interpolation method {} not available."
         raise Exception(msg.format(method.name))
 
-    geobox = acq.gridded_geo_box()
+    geobox = acqs[0].gridded_geo_box()
     cols, rows = geobox.get_shape_xy()
 
     # read the relevant tables into DataFrames
@@ -420,9 +451,6 @@ def interpolate(
     start = boxline.start_index.values
     end = boxline.end_index.values
 
-    band_records = coefficients.band_name == acq.band_name
-    samples = coefficients[coefficient.value][band_records].values
-
     func_map = {
         Method.BILINEAR: sheared_bilinear_interpolate,
         Method.SHEAR: sheared_bilinear_interpolate,
@@ -430,48 +458,54 @@ def interpolate(
         Method.SCIPY: scipy_interpolate,
     }
 
-    args = [cols, rows, coord, samples, start, end, centre]
-    if method == Method.BILINEAR:
-        args.extend([False, False])
-    elif method == Method.SHEARB:
-        args.extend([True, True])
-    else:
-        pass
-
-    result = func_map[method](*args)
-
     assert out_group is not None
     fid = out_group
 
     if GroupName.INTERP_GROUP.value not in fid:
         fid.create_group(GroupName.INTERP_GROUP.value)
 
-    if filter_opts is None:
-        filter_opts = {}
-    else:
-        filter_opts = filter_opts.copy()
-    filter_opts["chunks"] = acq.tile_size
-
     group = fid[GroupName.INTERP_GROUP.value]
 
-    fmt = DatasetName.INTERPOLATION_FMT.value
-    dset_name = fmt.format(coefficient=coefficient.value, band_name=acq.band_name)
-    no_data = np.nan
-    attrs = {
-        "crs_wkt": geobox.crs.ExportToWkt(),
-        "geotransform": geobox.transform.to_gdal(),
-        "no_data_value": no_data,
-        "interpolation_method": method.name,
-        "band_id": acq.band_id,
-        "band_name": acq.band_name,
-        "alias": acq.alias,
-        "coefficient": coefficient.value,
-    }
-    desc = (
-        "Contains the interpolated result of coefficient {} "
-        "for band {} from sensor {}."
-    )
-    attrs["description"] = desc.format(coefficient.value, acq.band_id, acq.sensor_id)
+    for acq in acqs:
+        band_records = coefficients.band_name == acq.band_name
+        samples = coefficients[coefficient.value][band_records].values
+
+        args = [cols, rows, coord, samples, start, end, centre]
+        if method == Method.BILINEAR:
+            args.extend([False, False])
+        elif method == Method.SHEARB:
+            args.extend([True, True])
+        else:
+            pass
+
+        result = func_map[method](*args)
+
+        if filter_opts is None:
+            band_filter_opts = {}
+        else:
+            band_filter_opts = filter_opts.copy()
+        band_filter_opts["chunks"] = acq.tile_size
+
+        fmt = DatasetName.INTERPOLATION_FMT.value
+        dset_name = fmt.format(coefficient=coefficient.value, band_name=acq.band_name)
+        no_data = np.nan
+        attrs = {
+            "crs_wkt": geobox.crs.ExportToWkt(),
+            "geotransform": geobox.transform.to_gdal(),
+            "no_data_value": no_data,
+            "interpolation_method": method.name,
+            "band_id": acq.band_id,
+            "band_name": acq.band_name,
+            "alias": acq.alias,
+            "coefficient": coefficient.value,
+        }
+        desc = (
+            "Contains the interpolated result of coefficient {} "
+            "for band {} from sensor {}."
+        )
+        attrs["description"] = desc.format(
+            coefficient.value, acq.band_id, acq.sensor_id
+        )
 
-    result[result == -999] = no_data
-    write_h5_image(result, dset_name, group, compression, attrs, filter_opts)
+        result[result == -999] = no_data
+        write_h5_image(result, dset_name, group, compression, attrs, band_filter_opts)
@@ -105,8 +105,11 @@ def create_lon_lat_grids(
         TODO.
 
     :return:
-        An opened `h5py.File` object, that is either in-memory using the
-        `core` driver, or on disk.
+        A `dict` containing the in-memory longitude and latitude
+        arrays keyed by DatasetName.LON.value and DatasetName.LAT.value,
+        which can be passed directly to
+        :py:func:`wagl.satellite_solar_angles.calculate_angles` to
+        avoid reading the grids back from `out_group`.
     """
     geobox = acquisition.gridded_geo_box()
 
@@ -117,8 +120,8 @@ def create_lon_lat_grids(
     shape = geobox.get_shape_yx()
 
     # Initialise the array to contain the result
-    result = np.zeros(shape, dtype="float64")
-    interpolate_grid(result, lon_func, depth=depth, origin=(0, 0), shape=shape)
+    lon = np.zeros(shape, dtype="float64")
+    interpolate_grid(lon, lon_func, depth=depth, origin=(0, 0), shape=shape)
 
     assert out_group is not None
     fid = out_group
@@ -136,12 +139,14 @@ def create_lon_lat_grids(
     }
 
     kwargs = compression.settings(filter_opts, chunks=acquisition.tile_size)
-    lon_dset = grp.create_dataset(DatasetName.LON.value, data=result, **kwargs)
+    lon_dset = grp.create_dataset(DatasetName.LON.value, data=lon, **kwargs)
     attach_image_attributes(lon_dset, attrs)
 
-    result = np.zeros(shape, dtype="float64")
-    interpolate_grid(result, lat_func, depth=depth, origin=(0, 0), shape=shape)
+    lat = np.zeros(shape, dtype="float64")
+    interpolate_grid(lat, lat_func, depth=depth, origin=(0, 0), shape=shape)
 
     attrs["description"] = LAT_DESC
-    lat_dset = grp.create_dataset(DatasetName.LAT.value, data=result, **kwargs)
+    lat_dset = grp.create_dataset(DatasetName.LAT.value, data=lat, **kwargs)
     attach_image_attributes(lat_dset, attrs)
+
+    return {DatasetName.LON.value: lon, DatasetName.LAT.value: lat}
@@ -79,6 +79,30 @@ def prepare_modtran(acquisitions, coordinate, albedos, basedir):
         shutil.copy(acq.spectral_filter_filepath, out_fname)
 
 
+def execute_modtran(modtran_exe, point, albedos, basedir):
+    """Executes MODTRAN for each albedo of a given point, using the
+    inputs prepared under `basedir`. The outputs are left within the
+    working directories for :py:func:`run_modtran` to channel.
+    """
+    for albedo in albedos:
+        workpath, json_mod_infile = _modtran_workpath(basedir, point, albedo)
+        subprocess.check_call([modtran_exe, json_mod_infile], cwd=workpath)
+
+
+def _modtran_workpath(basedir, point, albedo):
+    """Return the MODTRAN working directory and JSON input filename."""
+    workpath = pjoin(
+        basedir, POINT_FMT.format(p=point), ALBEDO_FMT.format(a=albedo.value)
+    )
+
+    json_mod_infile = pjoin(
+        workpath,
+        "".join([POINT_ALBEDO_FMT.format(p=point, a=albedo.value), ".json"]),
+    )
+
+    return workpath, json_mod_infile
+
+
 def format_json(
     acquisitions,
     ancillary_group,
@@ -255,8 +279,12 @@ def run_modtran(
     out_group,
     compression=H5CompressionFilter.LZF,
     filter_opts=None,
+    execute=True,
 ):
-    """Run MODTRAN and channel results."""
+    """Run MODTRAN and channel results.
+    If `execute` is False, MODTRAN is assumed to have already been run
+    (see :py:func:`execute_modtran`), and only the results are channeled.
+    """
     lonlat = atmospherics_group[POINT_FMT.format(p=point)].attrs["lonlat"]
 
     assert out_group is not None
@@ -287,18 +315,12 @@ def run_modtran(
     acqs = acquisitions
     for albedo in albedos:
         base_attrs["Albedo"] = albedo.value
-        workpath = pjoin(
-            basedir, POINT_FMT.format(p=point), ALBEDO_FMT.format(a=albedo.value)
-        )
-
-        json_mod_infile = pjoin(
-            workpath,
-            "".join([POINT_ALBEDO_FMT.format(p=point, a=albedo.value), ".json"]),
-        )
+        workpath, json_mod_infile = _modtran_workpath(basedir, point, albedo)
 
         group_path = ppjoin(base_path, ALBEDO_FMT.format(a=albedo.value))
 
-        subprocess.check_call([modtran_exe, json_mod_infile], cwd=workpath)
+        if execute:
+            subprocess.check_call([modtran_exe, json_mod_infile], cwd=workpath)
 
         chn_fname = glob.glob(pjoin(workpath, "*.chn"))[0]
         tp6_fname = glob.glob(pjoin(workpath, "*.tp6"))[0]
@@ -1,7 +1,10 @@
 """Utilities to handle MTL files."""
 
+import copy
 import datetime
+import os
 import re
+from functools import lru_cache
 from typing import IO, Union
 
 
@@ -45,6 +48,33 @@ def parse_type(s):
 
 def load_mtl(filename: Union[str, IO], root=None, pairs=r"(\w+)\s=\s(.*)") -> dict:
     """Parse an MTL file and return dict-of-dict's containing the metadata."""
+    if isinstance(filename, str):
+        # parsed files are cached, keyed on their modification time so
+        # an edited file is re-read; callers get their own copy
+        tree = _load_mtl_file(
+            os.path.abspath(filename), os.path.getmtime(filename), root, pairs
+        )
+        return copy.deepcopy(tree)
+
+    # individual member within a tar opened for extraction
+    data = [line.strip().decode() for line in filename.readlines()]
+
+    return _parse_mtl(data, root, pairs)
+
+
+@lru_cache(maxsize=128)
+def _load_mtl_file(pathname, mtime, root, pairs):
+    """Parse the MTL file at `pathname`; `mtime` is only part of the
+    cache key.
+    """
+    with open(pathname) as fo:
+        data = fo.readlines()
+
+    return _parse_mtl(data, root, pairs)
+
+
+def _parse_mtl(data, root, pairs):
+    """Parse the lines of an MTL file into a dict-of-dict's."""
 
     def parse(lines, tree, level=0):
         """Parse it."""
@@ -63,13 +93,6 @@ def load_mtl(filename: Union[str, IO], root=None, pairs=r"(\w+)\s=\s(.*)") -> di
 
     tree = {}
 
-    if isinstance(filename, str):
-        with open(filename) as fo:
-            data = fo.readlines()
-    else:
-        # individual member within a tar opened for extraction
-        data = [line.strip().decode() for line in filename.readlines()]
-
     parse(data, tree)
 
     if root is None:
@@ -93,6 +93,16 @@ def reflectance_python(
 NO_DATA_VALUE = -999
 
 
+def _read_f32(dataset, idx, shape):
+    """Read a tile of `dataset` as float32, transposed for the Fortran
+    kernel. Any type conversion is done by HDF5 during the read, rather
+    than through a second full size copy.
+    """
+    out = np.empty(shape, dtype=np.float32)
+    dataset.read_direct(out, source_sel=idx)
+    return out.transpose()
+
+
 def calculate_reflectance(
     acquisition,
     interpolation_group,
@@ -275,6 +285,10 @@ def calculate_reflectance(
     kwargs["fillvalue"] = NO_DATA_VALUE
     kwargs["dtype"] = "int16"
 
+    # no timestamps in the object headers; fewer metadata updates and
+    # reproducible output files
+    kwargs["track_times"] = False
+
     # create the datasets
     dname_fmt = DatasetName.REFLECTANCE_FMT.value
     dname = dname_fmt.format(product=AP.LAMBERTIAN.value, band_name=bn)
@@ -313,96 +327,101 @@ def calculate_reflectance(
     attrs["description"] = desc
     attach_image_attributes(nbart_dset, attrs)
 
-    # process by tile
-    for tile in acquisition.tiles():
-        # tile indices
-        idx = (slice(tile[0][0], tile[0][1]), slice(tile[1][0], tile[1][1]))
-
-        # define some static arguments
-        acq_args = {"window": tile, "out_no_data": NO_DATA_VALUE, "esun": esun}
-        f32_args = {"dtype": np.float32, "transpose": True}
-
-        # Read the data corresponding to the current tile for all dataset
-        # Convert the datatype if required and transpose
-        band_data = as_array(acquisition.radiance_data(**acq_args), **f32_args)
-
-        if np.all(band_data == NO_DATA_VALUE):
-            lmbrt_dset[idx] = NO_DATA_VALUE
-            nbar_dset[idx] = NO_DATA_VALUE
-            nbart_dset[idx] = NO_DATA_VALUE
-            continue
-
-        shadow = as_array(shadow_dataset[idx], np.int8, transpose=True)
-        solar_zenith = as_array(solar_zenith_dset[idx], **f32_args)
-        solar_azimuth = as_array(solar_azimuth_dset[idx], **f32_args)
-        satellite_view = as_array(satellite_v_dset[idx], **f32_args)
-        relative_angle = as_array(relative_a_dset[idx], **f32_args)
-        slope = as_array(slope_dataset[idx], **f32_args)
-        aspect = as_array(aspect_dataset[idx], **f32_args)
-        incident_angle = as_array(incident_angle_dataset[idx], **f32_args)
-        exiting_angle = as_array(exiting_angle_dataset[idx], **f32_args)
-        relative_slope = as_array(relative_s_dset[idx], **f32_args)
-        a_mod = as_array(a_dataset[idx], **f32_args)
-        b_mod = as_array(b_dataset[idx], **f32_args)
-        s_mod = as_array(s_dataset[idx], **f32_args)
-        fs = as_array(fs_dataset[idx], **f32_args)
-        fv = as_array(fv_dataset[idx], **f32_args)
-        ts = as_array(ts_dataset[idx], **f32_args)
-        direct = as_array(dir_dataset[idx], **f32_args)
-        diffuse = as_array(dif_dataset[idx], **f32_args)
-
-        # Allocate the output arrays
-        xsize, ysize = band_data.shape  # band_data has been transposed
-        ref_lm = np.zeros((ysize, xsize), dtype="int16")
-        ref_brdf = np.zeros((ysize, xsize), dtype="int16")
-        ref_terrain = np.zeros((ysize, xsize), dtype="int16")
-
-        # Allocate the work arrays (single row of data)
-        ref_lm_work = np.zeros(xsize, dtype="float32")
-        ref_brdf_work = np.zeros(xsize, dtype="float32")
-        ref_terrain_work = np.zeros(xsize, dtype="float32")
-
-        # Run terrain correction
-        reflectance_python(
-            xsize,
-            ysize,
-            rori,
-            brdf_alpha1,
-            brdf_alpha2,
-            acquisition.reflectance_adjustment,
-            kwargs["fillvalue"],
-            band_data,
-            shadow,
-            solar_zenith,
-            solar_azimuth,
-            satellite_view,
-            relative_angle,
-            slope,
-            aspect,
-            incident_angle,
-            exiting_angle,
-            relative_slope,
-            a_mod,
-            b_mod,
-            s_mod,
-            fs,
-            fv,
-            ts,
-            direct,
-            diffuse,
-            ref_lm_work,
-            ref_brdf_work,
-            ref_terrain_work,
-            ref_lm.transpose(),
-            ref_brdf.transpose(),
-            ref_terrain.transpose(),
-            normalized_solar_zenith,
-        )
-
-        # Write the current tile to disk
-        lmbrt_dset[idx] = ref_lm
-        nbar_dset[idx] = ref_brdf
-        nbart_dset[idx] = ref_terrain
+    # process by tile; holding the acquisition open across the tiled reads
+    with acquisition.keep_open():
+        for tile in acquisition.tiles():
+            # tile indices
+            idx = (slice(tile[0][0], tile[0][1]), slice(tile[1][0], tile[1][1]))
+
+            # define some static arguments
+            acq_args = {"window": tile, "out_no_data": NO_DATA_VALUE, "esun": esun}
+            f32_args = {"dtype": np.float32, "transpose": True}
+            tile_shape = (tile[0][1] - tile[0][0], tile[1][1] - tile[1][0])
+
+            # Read the data corresponding to the current tile for all dataset
+            # Convert the datatype if required and transpose
+            band_data = as_array(acquisition.radiance_data(**acq_args), **f32_args)
+
+            if np.all(band_data == NO_DATA_VALUE):
+                lmbrt_dset[idx] = NO_DATA_VALUE
+                nbar_dset[idx] = NO_DATA_VALUE
+                nbart_dset[idx] = NO_DATA_VALUE
+                continue
+
+            # the combined mask is stored as bool, which shares its
+            # one byte layout with the kernel's integer*1, so reinterpret
+            # rather than copy
+            shadow = shadow_dataset[idx].view(np.int8).transpose()
+            solar_zenith = _read_f32(solar_zenith_dset, idx, tile_shape)
+            solar_azimuth = _read_f32(solar_azimuth_dset, idx, tile_shape)
+            satellite_view = _read_f32(satellite_v_dset, idx, tile_shape)
+            relative_angle = _read_f32(relative_a_dset, idx, tile_shape)
+            slope = _read_f32(slope_dataset, idx, tile_shape)
+            aspect = _read_f32(aspect_dataset, idx, tile_shape)
+            incident_angle = _read_f32(incident_angle_dataset, idx, tile_shape)
+            exiting_angle = _read_f32(exiting_angle_dataset, idx, tile_shape)
+            relative_slope = _read_f32(relative_s_dset, idx, tile_shape)
+            a_mod = _read_f32(a_dataset, idx, tile_shape)
+            b_mod = _read_f32(b_dataset, idx, tile_shape)
+            s_mod = _read_f32(s_dataset, idx, tile_shape)
+            fs = _read_f32(fs_dataset, idx, tile_shape)
+            fv = _read_f32(fv_dataset, idx, tile_shape)
+            ts = _read_f32(ts_dataset, idx, tile_shape)
+            direct = _read_f32(dir_dataset, idx, tile_shape)
+            diffuse = _read_f32(dif_dataset, idx, tile_shape)
+
+            # Allocate the output arrays
+            xsize, ysize = band_data.shape  # band_data has been transposed
+            ref_lm = np.zeros((ysize, xsize), dtype="int16")
+            ref_brdf = np.zeros((ysize, xsize), dtype="int16")
+            ref_terrain = np.zeros((ysize, xsize), dtype="int16")
+
+            # Allocate the work arrays (single row of data)
+            ref_lm_work = np.zeros(xsize, dtype="float32")
+            ref_brdf_work = np.zeros(xsize, dtype="float32")
+            ref_terrain_work = np.zeros(xsize, dtype="float32")
+
+            # Run terrain correction
+            reflectance_python(
+                xsize,
+                ysize,
+                rori,
+                brdf_alpha1,
+                brdf_alpha2,
+                acquisition.reflectance_adjustment,
+                kwargs["fillvalue"],
+                band_data,
+                shadow,
+                solar_zenith,
+                solar_azimuth,
+                satellite_view,
+                relative_angle,
+                slope,
+                aspect,
+                incident_angle,
+                exiting_angle,
+                relative_slope,
+                a_mod,
+                b_mod,
+                s_mod,
+                fs,
+                fv,
+                ts,
+                direct,
+                diffuse,
+                ref_lm_work,
+                ref_brdf_work,
+                ref_terrain_work,
+                ref_lm.transpose(),
+                ref_brdf.transpose(),
+                ref_terrain.transpose(),
+                normalized_solar_zenith,
+            )
+
+            # Write the current tile to disk
+            lmbrt_dset[idx] = ref_lm
+            nbar_dset[idx] = ref_brdf
+            nbart_dset[idx] = ref_terrain
 
     # close any still opened files, arrays etc associated with the acquisition
     acquisition.close()
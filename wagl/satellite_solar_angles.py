@@ -892,6 +892,11 @@ def calculate_angles(
         * DatasetName.LON
         * DatasetName.LAT
 
+        Any mapping of the same names to in-memory arrays, such as
+        the result of
+        :py:func:`wagl.longitude_latitude_arrays.create_lon_lat_grids`,
+        is also accepted.
+
     :param out_group:
         A writeable HDF5 `Group` object.
 
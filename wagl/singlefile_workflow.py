@@ -85,13 +85,18 @@ class DataStandardisation(luigi.Task):
     tle_path = luigi.Parameter(significant=False)
     rori = luigi.FloatParameter(default=0.52, significant=False)
     compression = luigi.EnumParameter(
-        enum=H5CompressionFilter, default=H5CompressionFilter.LZF, significant=False
+        enum=H5CompressionFilter,
+        default=H5CompressionFilter.BITSHUFFLE,
+        significant=False,
     )
     filter_opts = luigi.DictParameter(default=None, significant=False)
     acq_parser_hint = luigi.OptionalParameter(default="")
     buffer_distance = luigi.FloatParameter(default=15000, significant=False)
     h5_driver = luigi.OptionalParameter(default="", significant=False)
     normalized_solar_zenith = luigi.FloatParameter(default=45.0)
+    modtran_workers = luigi.IntParameter(default=1, significant=False)
+    scaled_sbt = luigi.BoolParameter()
+    modtran_tmpdir = luigi.OptionalParameter(default="", significant=False)
 
     def output(self):
         fmt = "{label}.wagl.h5"
@@ -101,7 +106,7 @@ class DataStandardisation(luigi.Task):
         return luigi.LocalTarget(pjoin(self.outdir, out_fname))
 
     def run(self):
-        if self.workflow == Workflow.STANDARD or self.workflow == Workflow.SBT:
+        if self.workflow in (Workflow.STANDARD, Workflow.SBT):
             ecmwf_path = self.ecmwf_path
         else:
             ecmwf_path = None
@@ -133,6 +138,9 @@ class DataStandardisation(luigi.Task):
                 self.h5_driver,
                 self.acq_parser_hint,
                 self.normalized_solar_zenith,
+                self.modtran_workers,
+                self.scaled_sbt,
+                self.modtran_tmpdir or None,
             )
 
 
@@ -146,37 +154,50 @@ class ARD(luigi.WrapperTask):
     level1 = luigi.OptionalParameter(default="", significant=False)
 
     def requires(self):
+        # parameters common to every granule
+        common_kwargs = {
+            "workflow": self.workflow,
+            "vertices": self.vertices,
+            "method": self.method,
+            "modtran_exe": self.modtran_exe,
+            "aerosol": self.aerosol,
+            "brdf": self.brdf,
+            "ozone_path": self.ozone_path,
+            "water_vapour": self.water_vapour,
+            "dem_path": self.dem_path,
+            "ecmwf_path": self.ecmwf_path,
+            "invariant_height_fname": self.invariant_height_fname,
+            "offshore_territory_boundary_path": self.offshore_territory_boundary_path,
+            "srtm_pathname": self.srtm_pathname,
+            "cop_pathname": self.cop_pathname,
+            "tle_path": self.tle_path,
+            "rori": self.rori,
+            "compression": self.compression,
+            "filter_opts": self.filter_opts,
+            "acq_parser_hint": self.acq_parser_hint,
+            "buffer_distance": self.buffer_distance,
+            "h5_driver": self.h5_driver,
+            "normalized_solar_zenith": self.normalized_solar_zenith,
+            "modtran_workers": self.modtran_workers,
+            "scaled_sbt": self.scaled_sbt,
+            "modtran_tmpdir": self.modtran_tmpdir,
+        }
+
+        # blank lines are skipped, and a level1 listed more than once
+        # is only parsed once
+        submitted = set()
         with open(self.level1_list) as src:
-            level1_list = [level1.strip() for level1 in src.readlines()]
-
-        for level1 in level1_list:
-            container = acquisitions(level1)
-            outdir = pjoin(self.outdir, f"{container.label}.wagl")
-            for granule in container.granules:
-                kwargs = {
-                    "level1": level1,
-                    "granule": granule,
-                    "workflow": self.workflow,
-                    "vertices": self.vertices,
-                    "method": self.method,
-                    "modtran_exe": self.modtran_exe,
-                    "outdir": outdir,
-                    "aerosol": self.aerosol,
-                    "brdf": self.brdf,
-                    "ozone_path": self.ozone_path,
-                    "water_vapour": self.water_vapour,
-                    "dem_path": self.dem_path,
-                    "ecmwf_path": self.ecmwf_path,
-                    "invariant_height_fname": self.invariant_height_fname,
-                    "dsm_fname": self.dsm_fname,
-                    "tle_path": self.tle_path,
-                    "rori": self.rori,
-                    "compression": self.compression,
-                    "filter_opts": self.filter_opts,
-                    "buffer_distance": self.buffer_distance,
-                    "h5_driver": self.h5_driver,
-                }
-                yield DataStandardisation(**kwargs)
+            for level1 in (line.strip() for line in src):
+                if not level1 or level1 in submitted:
+                    continue
+                submitted.add(level1)
+
+                container = acquisitions(level1, hint=self.acq_parser_hint)
+                outdir = pjoin(self.outdir, f"{container.label}.wagl")
+                for granule in container.granules:
+                    yield DataStandardisation(
+                        level1=level1, granule=granule, outdir=outdir, **common_kwargs
+                    )
 
 
 if __name__ == "__main__":
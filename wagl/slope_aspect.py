@@ -131,9 +131,7 @@ def slope_aspect_arrays(
 
     # Define an array of latitudes
     # This will be ignored if is_utm == True
-    alat = np.array(
-        [y_origin - i * y_res for i in range(-1, nrow - 1)], dtype=np.float64
-    )  # yes, I did mean float64.
+    alat = y_origin - np.arange(-1, nrow - 1, dtype=np.float64) * y_res
 
     # Output the reprojected result
     assert out_group is not None
@@ -3,6 +3,8 @@
 
 import json
 import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import ExitStack
 from os.path import join as pjoin
 
 import h5py
@@ -20,6 +22,7 @@ from wagl.constants import (
     GroupName,
     Workflow,
 )
+from wagl.data import available_cpus
 from wagl.dsm import get_dsm
 from wagl.hdf5 import H5CompressionFilter, read_h5_table
 from wagl.incident_exiting_angles import (
@@ -27,13 +30,14 @@ from wagl.incident_exiting_angles import (
     incident_angles,
     relative_azimuth_slope,
 )
-from wagl.interpolation import interpolate
+from wagl.interpolation import interpolate_batch
 from wagl.logs import STATUS_LOGGER
 from wagl.longitude_latitude_arrays import create_lon_lat_grids
 from wagl.metadata import create_ard_yaml
 from wagl.modtran import (
     JsonEncoder,
     calculate_coefficients,
+    execute_modtran,
     format_json,
     prepare_modtran,
     run_modtran,
@@ -43,11 +47,23 @@ from wagl.satellite_solar_angles import calculate_angles
 from wagl.slope_aspect import slope_aspect_arrays
 from wagl.temperature import surface_brightness_temperature
 from wagl.terrain_shadow_masks import (
-    calculate_cast_shadow,
+    calculate_cast_shadows,
     combine_shadow_masks,
     self_shadow,
 )
 
+# raw data chunk cache for the output file; the many chunked datasets are
+# written and then re-read by later stages, so allow a much larger cache
+# than the 1 MiB HDF5 default. The cache is allocated per open dataset,
+# hence it is kept modest. The number of slots should be a prime.
+RDCC_NBYTES = 64 * 1024 * 1024
+RDCC_NSLOTS = 100003
+RDCC_W0 = 0.75
+
+# paged aggregation of file space; metadata and small raw data are
+# gathered into fixed size pages, rather than scattered through the file
+FS_PAGE_SIZE = 1024 * 1024
+
 
 # pylint disable=too-many-arguments
 def card4l(
@@ -71,11 +87,14 @@ def card4l(
     ecmwf_path=None,
     rori=0.52,
     buffer_distance=8000,
-    compression=H5CompressionFilter.LZF,
+    compression=H5CompressionFilter.BITSHUFFLE,
     filter_opts=None,
     h5_driver=None,
     acq_parser_hint=None,
     normalized_solar_zenith=45.0,
+    modtran_workers=1,
+    scaled_sbt=False,
+    modtran_tmpdir=None,
 ):
     """CEOS Analysis Ready Data for Land.
     A workflow for producing standardised products that meet the
@@ -170,7 +189,9 @@ def card4l(
         An enum from hdf5.compression.H5CompressionFilter representing
         the desired compression filter to use for writing H5 IMAGE and
         TABLE class datasets to disk.
-        Default is H5CompressionFilter.LZF.
+        Default is H5CompressionFilter.BITSHUFFLE (bitshuffle + LZ4,
+        registered via hdf5plugin), which reads faster and compresses
+        better than LZF for the imagery produced by this workflow.
 
     :param filter_opts:
         A dict containing any additional keyword arguments when
@@ -191,12 +212,44 @@ def card4l(
 
     :param normalized_solar_zenith:
         Solar zenith angle to normalize for (in degrees). Default is 45 degrees.
+
+    :param modtran_workers:
+        The number of MODTRAN executions to run concurrently.
+        Default is 1; which runs the executions serially.
+        A value of 0 uses the number of CPUs available to the
+        current process. Each concurrent execution holds its own
+        workspace, so take the scheduler's workers and memory
+        request into account before raising this.
+
+    :param scaled_sbt:
+        If set, the surface brightness temperature is stored as
+        scaled int16 values rather than float32; the scale_factor and
+        add_offset are recorded as attributes of each dataset.
+        Default is False.
+
+    :param modtran_tmpdir:
+        The directory in which the short lived MODTRAN workspaces are
+        created, e.g. a memory backed filesystem such as /dev/shm.
+        Note that a memory backed filesystem counts against the
+        process's (or job's) memory.
+        Default is None; which uses the standard temporary directory
+        (see `tempfile.gettempdir`).
     """
 
     container = acquisitions(level1, hint=acq_parser_hint)
 
     # TODO: pass through an acquisitions container rather than pathname
-    with h5py.File(out_fname, "w", driver=h5_driver) as fid:
+    with h5py.File(
+        out_fname,
+        "w",
+        driver=h5_driver,
+        libver="latest",
+        rdcc_nbytes=RDCC_NBYTES,
+        rdcc_nslots=RDCC_NSLOTS,
+        rdcc_w0=RDCC_W0,
+        fs_strategy="page",
+        fs_page_size=FS_PAGE_SIZE,
+    ) as fid:
         fid.attrs["level1_uri"] = level1
 
         # granule root group
@@ -242,6 +295,8 @@ def card4l(
             modtran_exe,
             compression,
             filter_opts,
+            modtran_workers,
+            modtran_tmpdir,
         )
 
         stash_interpolation(
@@ -263,6 +318,7 @@ def card4l(
             normalized_solar_zenith,
             compression,
             filter_opts,
+            scaled_sbt,
         )
 
         stash_metadata(
@@ -291,6 +347,9 @@ def stash_oa_bands(
     compression,
     filter_opts,
 ):
+    # terrain related bands are only required for the NBAR workflows
+    terrain = workflow in (Workflow.STANDARD, Workflow.NBAR)
+
     for grp_name in container.supported_groups:
         log = STATUS_LOGGER.bind(
             level1=container.label, granule=granule, granule_group=grp_name
@@ -305,20 +364,24 @@ def stash_oa_bands(
 
         # longitude and latitude
         log.info("Latitude-Longitude")
-        create_lon_lat_grids(acqs[0], root, compression, filter_opts)
+        lon_lat = create_lon_lat_grids(acqs[0], root, compression, filter_opts)
 
-        # satellite and solar angles
+        # satellite and solar angles; computed from the in-memory grids
+        # rather than reading them back from disk
         log.info("Satellite-Solar-Angles")
         calculate_angles(
             acqs[0],
-            root[GroupName.LON_LAT_GROUP.value],
+            lon_lat,
             root,
             compression,
             filter_opts,
             tle_path,
         )
+        del lon_lat
+
+        if terrain:
+            sat_sol_grp = root[GroupName.SAT_SOL_GROUP.value]
 
-        if workflow in (Workflow.STANDARD, Workflow.NBAR):
             # DEM
             log.info("DEM-retriveal")
             get_dsm(
@@ -330,45 +393,47 @@ def stash_oa_bands(
                 compression,
                 filter_opts,
             )
+            dsm_grp = root[GroupName.ELEVATION_GROUP.value]
 
             # slope & aspect
             log.info("Slope-Aspect")
             slope_aspect_arrays(
                 acqs[0],
-                root[GroupName.ELEVATION_GROUP.value],
+                dsm_grp,
                 buffer_distance,
                 root,
                 compression,
                 filter_opts,
             )
+            slp_asp_grp = root[GroupName.SLP_ASP_GROUP.value]
 
             # incident angles
             log.info("Incident-Angles")
             incident_angles(
-                root[GroupName.SAT_SOL_GROUP.value],
-                root[GroupName.SLP_ASP_GROUP.value],
+                sat_sol_grp,
+                slp_asp_grp,
                 root,
                 compression,
                 filter_opts,
             )
+            incident_grp = root[GroupName.INCIDENT_GROUP.value]
 
             # exiting angles
             log.info("Exiting-Angles")
             exiting_angles(
-                root[GroupName.SAT_SOL_GROUP.value],
-                root[GroupName.SLP_ASP_GROUP.value],
+                sat_sol_grp,
+                slp_asp_grp,
                 root,
                 compression,
                 filter_opts,
             )
+            exiting_grp = root[GroupName.EXITING_GROUP.value]
 
             # relative azimuth slope
             log.info("Relative-Azimuth-Angles")
-            incident_group_name = GroupName.INCIDENT_GROUP.value
-            exiting_group_name = GroupName.EXITING_GROUP.value
             relative_azimuth_slope(
-                root[incident_group_name],
-                root[exiting_group_name],
+                incident_grp,
+                exiting_grp,
                 root,
                 compression,
                 filter_opts,
@@ -377,45 +442,32 @@ def stash_oa_bands(
             # self shadow
             log.info("Self-Shadow")
             self_shadow(
-                root[incident_group_name],
-                root[exiting_group_name],
+                incident_grp,
+                exiting_grp,
                 root,
                 compression,
                 filter_opts,
             )
 
-            # cast shadow solar source direction
-            log.info("Cast-Shadow-Solar-Direction")
-            dsm_group_name = GroupName.ELEVATION_GROUP.value
-            calculate_cast_shadow(
+            # cast shadow for both the solar and satellite source directions
+            log.info("Cast-Shadow")
+            calculate_cast_shadows(
                 acqs[0],
-                root[dsm_group_name],
-                root[GroupName.SAT_SOL_GROUP.value],
+                dsm_grp,
+                sat_sol_grp,
                 buffer_distance,
                 root,
                 compression,
                 filter_opts,
             )
 
-            # cast shadow satellite source direction
-            log.info("Cast-Shadow-Satellite-Direction")
-            calculate_cast_shadow(
-                acqs[0],
-                root[dsm_group_name],
-                root[GroupName.SAT_SOL_GROUP.value],
-                buffer_distance,
-                root,
-                compression,
-                filter_opts,
-                False,
-            )
-
             # combined shadow masks
             log.info("Combined-Shadow")
+            shadow_grp = root[GroupName.SHADOW_GROUP.value]
             combine_shadow_masks(
-                root[GroupName.SHADOW_GROUP.value],
-                root[GroupName.SHADOW_GROUP.value],
-                root[GroupName.SHADOW_GROUP.value],
+                shadow_grp,
+                shadow_grp,
+                shadow_grp,
                 root,
                 compression,
                 filter_opts,
@@ -482,6 +534,8 @@ def stash_atmospherics(
     modtran_exe,
     compression,
     filter_opts,
+    modtran_workers=1,
+    modtran_tmpdir=None,
 ):
     log = STATUS_LOGGER.bind(
         level1=container.label, granule=granule, granule_group=None
@@ -511,13 +565,53 @@ def stash_atmospherics(
     json_fmt = pjoin(POINT_FMT, ALBEDO_FMT, "".join([POINT_ALBEDO_FMT, ".json"]))
     nvertices = vertices[0] * vertices[1]
 
-    # radiative transfer for each point and albedo
-    for key in json_data:
-        point, albedo = key
+    if not modtran_workers:
+        modtran_workers = available_cpus()
 
-        log.info("Radiative-Transfer", point=point, albedo=albedo.value)
+    def channel_results(future):
+        """Channel a completed execution into the HDF5 file, and
+        release its workspace.
+        """
+        future.result()
+        point, albedo, workspace = jobs.pop(future)
 
-        with tempfile.TemporaryDirectory() as tmpdir:
+        run_modtran(
+            acqs,
+            inputs_grp,
+            workflow,
+            nvertices,
+            point,
+            [albedo],
+            modtran_exe,
+            workspace.name,
+            root,
+            compression,
+            filter_opts,
+            execute=False,
+        )
+
+        workspace.cleanup()
+
+    # radiative transfer for each point and albedo
+    # MODTRAN runs as an external process, so the executions can be
+    # dispatched concurrently, and the results channeled into the HDF5 file
+    # as each completes, keeping all HDF5 access on this thread
+    jobs = {}
+    with ExitStack() as stack, ThreadPoolExecutor(modtran_workers) as executor:
+        for key in json_data:
+            # only prepare a workspace once a worker is free for it
+            while len(jobs) >= modtran_workers:
+                done, _ = wait(jobs, return_when=FIRST_COMPLETED)
+                for future in done:
+                    channel_results(future)
+
+            point, albedo = key
+
+            log.info("Radiative-Transfer", point=point, albedo=albedo.value)
+
+            workspace = tempfile.TemporaryDirectory(dir=modtran_tmpdir)
+            stack.callback(workspace.cleanup)
+            tmpdir = workspace.name
             prepare_modtran(acqs, point, [albedo], tmpdir)
 
             point_dir = pjoin(tmpdir, POINT_FMT.format(p=point))
@@ -558,19 +652,15 @@ def stash_atmospherics(
 
                 json.dump(json_dict, src, cls=JsonEncoder, indent=4)
 
-            run_modtran(
-                acqs,
-                inputs_grp,
-                workflow,
-                nvertices,
-                point,
-                [albedo],
-                modtran_exe,
-                tmpdir,
-                root,
-                compression,
-                filter_opts,
+            future = executor.submit(
+                execute_modtran, modtran_exe, point, [albedo], tmpdir
             )
+            jobs[future] = (point, albedo, workspace)
+
+        while jobs:
+            done, _ = wait(jobs, return_when=FIRST_COMPLETED)
+            for future in done:
+                channel_results(future)
 
 
 def nbar_acquisitions(container, granule, grp_name):
@@ -624,32 +714,38 @@ def stash_interpolation(
         sat_sol_grp = res_group[GroupName.SAT_SOL_GROUP.value]
         comp_grp = root[GroupName.COEFFICIENTS_GROUP.value]
 
+        # band selections are fixed for a group; resolve them once
+        nbar_acqs = nbar_acquisitions(container, granule, grp_name)
+        sbt_acqs = sbt_acquisitions(container, granule, grp_name)
+
         for coefficient in workflow.atmos_coefficients:
             if coefficient is AtmosphericCoefficients.ESUN:
                 continue
 
             if coefficient in Workflow.NBAR.atmos_coefficients:
-                band_acqs = nbar_acquisitions(container, granule, grp_name)
+                band_acqs = nbar_acqs
             else:
-                band_acqs = sbt_acquisitions(container, granule, grp_name)
+                band_acqs = sbt_acqs
 
-            for acq in band_acqs:
-                log.info(
-                    "Interpolate",
-                    band_id=acq.band_id,
-                    coefficient=coefficient.value,
-                )
-                interpolate(
-                    acq,
-                    coefficient,
-                    ancillary_group,
-                    sat_sol_grp,
-                    comp_grp,
-                    res_group,
-                    compression,
-                    filter_opts,
-                    method,
-                )
+            if not band_acqs:
+                continue
+
+            log.info(
+                "Interpolate",
+                band_ids=[acq.band_id for acq in band_acqs],
+                coefficient=coefficient.value,
+            )
+            interpolate_batch(
+                band_acqs,
+                coefficient,
+                ancillary_group,
+                sat_sol_grp,
+                comp_grp,
+                res_group,
+                compression,
+                filter_opts,
+                method,
+            )
 
 
 def get_esun_values(
@@ -661,14 +757,16 @@ def get_esun_values(
 
     comp_grp = root[GroupName.COEFFICIENTS_GROUP.value]
 
+    # read the coefficients table once, and index ESUN by band name;
+    # the table has a row per point and band, use each band's first row
+    atmos_coefs = read_h5_table(comp_grp, DatasetName.NBAR_COEFFICIENTS.value)
+    esun_lookup = atmos_coefs.drop_duplicates("band_name", keep="first").set_index(
+        "band_name"
+    )[AtmosphericCoefficients.ESUN.value]
+
     for grp_name in container.supported_groups:
         for acq in nbar_acquisitions(container, granule, grp_name):
-            atmos_coefs = read_h5_table(comp_grp, DatasetName.NBAR_COEFFICIENTS.value)
-            esun_values[acq.band_name] = (
-                atmos_coefs[atmos_coefs.band_name == acq.band_name][
-                    AtmosphericCoefficients.ESUN.value
-                ]
-            ).values[0]
+            esun_values[acq.band_name] = esun_lookup[acq.band_name]
 
     return esun_values
 
@@ -682,6 +780,7 @@ def stash_reflectance(
     normalized_solar_zenith,
     compression,
     filter_opts,
+    scaled_sbt=False,
 ):
     ancillary_group = root[GroupName.ANCILLARY_GROUP.value]
     esun_values = get_esun_values(root, container, granule)
@@ -694,25 +793,30 @@ def stash_reflectance(
 
         res_group = root[grp_name]
         sat_sol_grp = res_group[GroupName.SAT_SOL_GROUP.value]
+        interp_grp = res_group[GroupName.INTERP_GROUP.value]
 
         # standardised products
         band_acqs = relevant_acquisitions(container, granule, grp_name, workflow)
 
-        for acq in band_acqs:
-            interp_grp = res_group[GroupName.INTERP_GROUP.value]
+        if any(acq.band_type == BandType.REFLECTIVE for acq in band_acqs):
+            slp_asp_grp = res_group[GroupName.SLP_ASP_GROUP.value]
+            rel_slp_asp = res_group[GroupName.REL_SLP_GROUP.value]
+            incident_grp = res_group[GroupName.INCIDENT_GROUP.value]
+            exiting_grp = res_group[GroupName.EXITING_GROUP.value]
+            shadow_grp = res_group[GroupName.SHADOW_GROUP.value]
 
+        for acq in band_acqs:
             if acq.band_type == BandType.THERMAL:
                 log.info("SBT", band_id=acq.band_id)
                 surface_brightness_temperature(
-                    acq, interp_grp, res_group, compression, filter_opts
+                    acq,
+                    interp_grp,
+                    res_group,
+                    compression,
+                    filter_opts,
+                    scaled=scaled_sbt,
                 )
             else:
-                slp_asp_grp = res_group[GroupName.SLP_ASP_GROUP.value]
-                rel_slp_asp = res_group[GroupName.REL_SLP_GROUP.value]
-                incident_grp = res_group[GroupName.INCIDENT_GROUP.value]
-                exiting_grp = res_group[GroupName.EXITING_GROUP.value]
-                shadow_grp = res_group[GroupName.SHADOW_GROUP.value]
-
                 log.info("Surface-Reflectance", band_id=acq.band_id)
                 calculate_reflectance(
                     acq,
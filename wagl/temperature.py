@@ -5,6 +5,8 @@
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import numexpr
 import numpy as np
@@ -15,6 +17,22 @@ from wagl.hdf5 import H5CompressionFilter, attach_image_attributes
 
 NO_DATA_VALUE = -999
 
+# scaled int16 encoding of the brightness temperature;
+# T[Kelvin] = stored * SBT_SCALE_FACTOR + SBT_ADD_OFFSET
+SBT_SCALE_FACTOR = 0.01
+SBT_ADD_OFFSET = 273.15
+SBT_SCALED_NO_DATA_VALUE = -32768
+
+# Brightness temperature from the at-sensor radiance, in a single pass.
+# Pixels with a non-finite transmittance (`finite` is False), or a
+# corrected radiance that isn't positive, are set to fillvalue.
+# isfinite is only available within numexpr from 2.12, so the finite
+# mask is evaluated by NumPy and supplied as an input.
+SBT_EXPRESSION = (
+    "where(finite & ((radiance - path_up) / trans > 0), "
+    "k2 / log1p(k1 / ((radiance - path_up) / trans)), fillvalue)"
+)
+
 
 def surface_brightness_temperature(
     acquisition,
@@ -22,6 +40,7 @@ def surface_brightness_temperature(
     out_group=None,
     compression=H5CompressionFilter.LZF,
     filter_opts=None,
+    scaled=False,
 ):
     """Convert Thermal acquisition to Surface Brightness Temperature.
 
@@ -68,6 +87,14 @@ def surface_brightness_temperature(
         Default is None, which will use the default settings for the
         chosen H5CompressionFilter instance.
 
+    :param scaled:
+        If set, the temperature is stored as int16 values scaled by
+        SBT_SCALE_FACTOR and offset by SBT_ADD_OFFSET, both recorded
+        as the dataset attributes `scale_factor` and `add_offset`,
+        with a no data value of SBT_SCALED_NO_DATA_VALUE.
+        This resolves the temperature to 0.01 Kelvin while halving the
+        storage. Default is False, which stores float32 Kelvin.
+
     :return:
         An opened `h5py.File` object, that is either in-memory using the
         `core` driver, or on disk.
@@ -100,8 +127,16 @@ def surface_brightness_temperature(
     group = fid[GroupName.STANDARD_GROUP.value]
     kwargs = compression.settings(filter_opts, chunks=acq.tile_size)
     kwargs["shape"] = (acq.lines, acq.samples)
-    kwargs["fillvalue"] = NO_DATA_VALUE
-    kwargs["dtype"] = "float32"
+    if scaled:
+        kwargs["fillvalue"] = SBT_SCALED_NO_DATA_VALUE
+        kwargs["dtype"] = "int16"
+    else:
+        kwargs["fillvalue"] = NO_DATA_VALUE
+        kwargs["dtype"] = "float32"
+
+    # no timestamps in the object headers; fewer metadata updates and
+    # reproducible output files
+    kwargs["track_times"] = False
 
     # attach some attributes to the image datasets
     attrs = {
@@ -122,34 +157,119 @@ def surface_brightness_temperature(
     out_dset = group.create_dataset(dataset_name, **kwargs)
 
     desc = "Surface Brightness Temperature in Kelvin."
+    if scaled:
+        attrs["scale_factor"] = SBT_SCALE_FACTOR
+        attrs["add_offset"] = SBT_ADD_OFFSET
     attrs["description"] = desc
     attach_image_attributes(out_dset, attrs)
 
-    # pylint: disable=unused-variable
     # constants
-    k1 = acq.K1  # noqa: F841
-    k2 = acq.K2  # noqa: F841
-
-    # process each tile
-    for tile in acq.tiles():
-        idx = (slice(tile[0][0], tile[0][1]), slice(tile[1][0], tile[1][1]))
-
-        acq.radiance_data(window=tile, out_no_data=NO_DATA_VALUE)
-        path_up = upwelling_radiation[idx]  # noqa: F841
-        trans = transmittance[idx]
-        mask = ~np.isfinite(trans)
-        expr = "(radiance - path_up) / trans"
-        corrected_radiance = numexpr.evaluate(expr)
-        mask |= corrected_radiance <= 0
-        expr = "k2 / log(k1 / corrected_radiance + 1)"
-        brightness_temp = numexpr.evaluate(expr)
-        brightness_temp[mask] = kwargs["fillvalue"]
-
-        out_dset[idx] = brightness_temp
+    # float32 throughout, so numexpr doesn't promote the kernel to float64
+    constants = {
+        "k1": np.float32(acq.K1),
+        "k2": np.float32(acq.K2),
+        "fillvalue": np.float32(NO_DATA_VALUE),
+    }
+
+    # tile buffers, allocated once and reused for every tile; the
+    # (smaller) edge tiles use a contiguous leading portion of each
+    tile_pixels = acq.tile_size[0] * acq.tile_size[1]
+    path_up_buf = np.empty(tile_pixels, dtype="float32")
+    trans_buf = np.empty(tile_pixels, dtype="float32")
+    out_buf = np.empty(tile_pixels, dtype="float32")
+    finite_buf = np.empty(tile_pixels, dtype="bool")
+    scaled_buf = np.empty(tile_pixels, dtype="int16") if scaled else None
+
+    # the radiance for the next tile is read in a background thread
+    # (GDAL releases the GIL) while the current tile is processed;
+    # the acquisition is held open across the tiled reads
+    tiles = list(acq.tiles())
+    read_radiance = partial(_radiance_tile, acq)
+
+    with acq.keep_open(), ThreadPoolExecutor(max_workers=1) as executor:
+        next_radiance = executor.submit(read_radiance, window=tiles[0])
+
+        # process each tile
+        for i, tile in enumerate(tiles):
+            idx = (slice(tile[0][0], tile[0][1]), slice(tile[1][0], tile[1][1]))
+            shape = (tile[0][1] - tile[0][0], tile[1][1] - tile[1][0])
+            npixels = shape[0] * shape[1]
+
+            radiance = next_radiance.result()
+            if i + 1 < len(tiles):
+                next_radiance = executor.submit(read_radiance, window=tiles[i + 1])
+
+            trans = trans_buf[:npixels].reshape(shape)
+            transmittance.read_direct(trans, source_sel=idx)
+            finite = np.isfinite(trans, out=finite_buf[:npixels].reshape(shape))
+
+            # tiles without a single valid pixel are left unwritten;
+            # they read back as the dataset's fill value
+            if not finite.any() or np.all(radiance == NO_DATA_VALUE):
+                continue
+
+            path_up = path_up_buf[:npixels].reshape(shape)
+            brightness_temp = out_buf[:npixels].reshape(shape)
+
+            upwelling_radiation.read_direct(path_up, source_sel=idx)
+
+            inputs = {
+                "radiance": radiance,
+                "path_up": path_up,
+                "trans": trans,
+                "finite": finite,
+            }
+            numexpr.evaluate(
+                SBT_EXPRESSION, local_dict={**inputs, **constants}, out=brightness_temp
+            )
+
+            if scaled:
+                scaled_temp = scaled_buf[:npixels].reshape(shape)
+                scale_temperature(brightness_temp, out=scaled_temp)
+                out_dset.write_direct(scaled_temp, dest_sel=idx)
+            else:
+                out_dset.write_direct(brightness_temp, dest_sel=idx)
     acq.close()  # If dataset is cached; clear it
 
 
-def radiance_conversion(band_array, gain, bias):
+def _radiance_tile(acquisition, window):
+    """Read a tile of at-sensor radiance as float32."""
+    radiance = acquisition.radiance_data(window=window, out_no_data=NO_DATA_VALUE)
+    return radiance.astype("float32", copy=False)
+
+
+def scale_temperature(temperature, out=None):
+    """Encode a brightness temperature array as scaled int16 values.
+
+    :param temperature:
+        A `NumPy` array of temperatures in Kelvin, with no data
+        pixels set to NO_DATA_VALUE.
+
+    :param out:
+        An optional int16 array, of the same shape as `temperature`,
+        to write the result into. Default is None, which allocates a
+        new array.
+
+    :return:
+        An int16 `NumPy` array of
+        (temperature - SBT_ADD_OFFSET) / SBT_SCALE_FACTOR, rounded to
+        the nearest integer and clipped to the int16 range, with no
+        data pixels set to SBT_SCALED_NO_DATA_VALUE.
+    """
+    scaled = np.subtract(temperature, SBT_ADD_OFFSET, dtype="float32")
+    scaled /= SBT_SCALE_FACTOR
+    np.rint(scaled, out=scaled)
+    np.clip(scaled, SBT_SCALED_NO_DATA_VALUE + 1, np.iinfo("int16").max, out=scaled)
+
+    if out is None:
+        out = np.empty(temperature.shape, dtype="int16")
+    np.copyto(out, scaled, casting="unsafe")
+    out[temperature == NO_DATA_VALUE] = SBT_SCALED_NO_DATA_VALUE
+
+    return out
+
+
+def radiance_conversion(band_array, gain, bias, out=None):
     """Converts the input image into radiance using the gain and bias
     method.
 
@@ -163,16 +283,24 @@ def radiance_conversion(band_array, gain, bias):
     :param bias:
         Floating point value.
 
+    :param out:
+        An optional floating point array, of the same shape as
+        `band_array`, to write the result into. Default is None,
+        which allocates a new array.
+
     :return:
         The thermal band converted to at-sensor radiance in
         watts/(meter squared * ster * um) as a 2D Numpy array.
     """
     logging.debug("gain = %f, bias = %f", gain, bias)
 
-    return numexpr.evaluate("gain * band_array + bias")
+    radiance = np.multiply(band_array, gain, out=out)
+    radiance += bias
+
+    return radiance
 
 
-def temperature_conversion(band_array, k1, k2):
+def temperature_conversion(band_array, k1, k2, out=None):
     """Converts the radiance image to degrees Kelvin.
 
     :param band_array:
@@ -185,13 +313,22 @@ def temperature_conversion(band_array, k1, k2):
     :param k2:
         Conversion constant 2.
 
+    :param out:
+        An optional array, of the same shape as `band_array`, to
+        write the result into. Default is None, which allocates a
+        new array.
+
     :return:
         A 2D Numpy array of the thermal band coverted to at-sensor
         degrees Kelvin.
     """
     logging.debug("k1 = %f, k2 = %f", k1, k2)
 
-    return k2 / (np.log(k1 / band_array + 1))
+    return numexpr.evaluate(
+        "k2 / log1p(k1 / band_array)",
+        local_dict={"band_array": band_array, "k1": k1, "k2": k2},
+        out=out,
+    )
 
 
 def get_landsat_temperature(acquisitions, pq_const):
@@ -214,9 +351,10 @@ def get_landsat_temperature(acquisitions, pq_const):
     acq = next(a for a in acqs if a.band_id == thermal_band)
     radiance = acq.radiance_data()
 
-    kelvin_array = temperature_conversion(radiance, acq.K1, acq.K2)
+    kelvin_array = np.empty(radiance.shape, dtype="float32")
+    temperature_conversion(radiance, acq.K1, acq.K2, out=kelvin_array)
 
-    return kelvin_array.astype("float32")
+    return kelvin_array
 
 
 def temperature_at_sensor(thermal_acquisition, window=None):
@@ -235,11 +373,6 @@ def temperature_at_sensor(thermal_acquisition, window=None):
         (thermal_acquisition.lines, thermal_acquisition.samples)
         or the dimensions given by the `window` parameter.
     """
-    k1 = thermal_acquisition.K1  # pylint: disable=unused-variable # noqa: F841
-    k2 = thermal_acquisition.K2  # pylint: disable=unused-variable # noqa: F841
-
-    # pylint: disable=unused-variable
-    data = thermal_acquisition.radiance_data(window=window)  # noqa: F841
-    result = numexpr.evaluate("k2 / (log(k1 / data + 1))")
+    data = thermal_acquisition.radiance_data(window=window)
 
-    return result
+    return temperature_conversion(data, thermal_acquisition.K1, thermal_acquisition.K2)
@@ -7,6 +7,7 @@ as source directions, as well as self shadow masks.
 ---------------------------------------------------
 """
 
+import numexpr
 import numpy as np
 
 from wagl.__cast_shadow_mask import cast_shadow_main as cast_shadow_prim
@@ -16,6 +17,9 @@ from wagl.hdf5 import H5CompressionFilter, attach_image_attributes
 from wagl.margins import pixel_buffer
 from wagl.tiling import generate_tiles
 
+# degrees to radians, as single precision to match the angle datasets
+D2R = np.float32(np.pi / 180)
+
 
 def self_shadow(
     incident_angles_group,
@@ -100,18 +104,74 @@ def self_shadow(
         idx = (slice(ystart, yend), slice(xstart, xend))
 
         # Read the data for the current tile
-        inc = np.radians(incident_angle[idx])
-        exi = np.radians(exiting_angle[idx])
-
-        # Process the tile
-        mask = np.ones(inc.shape, dtype="uint8")
-        mask[np.cos(inc) <= 0.0] = 0
-        mask[np.cos(exi) <= 0.0] = 0
+        inc = incident_angle[idx]
+        exi = exiting_angle[idx]
+
+        # Process the tile; evaluated in a single pass without temporaries
+        # only pixels facing away from the sun or sensor are shadowed, so
+        # null (NaN) angles remain unshadowed
+        mask = numexpr.evaluate(
+            "~((cos(inc * d2r) <= 0) | (cos(exi * d2r) <= 0))",
+            local_dict={"inc": inc, "exi": exi, "d2r": D2R},
+        )
 
         # Write the current tile to disk
         out_dset[idx] = mask
 
 
+def _access_error(d, n):
+    """Generate an invalid array access message."""
+    return f"attempt to access invalid {d} of {n}"
+
+
+#: Messages for the error codes returned by the cast shadow Fortran code
+_CAST_SHADOW_MESSAGES = {
+    20: _access_error("x", "dem"),
+    21: _access_error("x", "dem_data"),
+    22: _access_error("x", "solar and sazi"),
+    23: _access_error("x", "solar_data"),
+    24: _access_error("x", "a"),
+    25: _access_error("y", "dem_data"),
+    26: _access_error("y", "a"),
+    27: _access_error("x", "mask_all"),
+    28: _access_error("y", "mask_all"),
+    29: _access_error("x", "mask"),
+    30: _access_error("y", "mask"),
+    31: _access_error("X", "dem and a"),
+    32: _access_error("y", "a"),
+    33: _access_error("y", "dem"),
+    34: _access_error("x", "mask_all"),
+    35: _access_error("x", "mask"),
+    36: _access_error("y", "mask_all"),
+    37: _access_error("y", "mask"),
+    38: _access_error("x", "dem"),
+    39: _access_error("x", "dem_data"),
+    40: _access_error("x", "solar"),
+    41: _access_error("x", "solar_data"),
+    42: _access_error("x", "a and dem"),
+    43: _access_error("y", "a"),
+    44: _access_error("y", "dem"),
+    45: _access_error("x", "mask_all"),
+    46: _access_error("x", "mask"),
+    47: _access_error("y", "mask_all"),
+    48: _access_error("y", "mask"),
+    49: _access_error("x", "a and dem"),
+    50: _access_error("y", "a"),
+    51: _access_error("y", "dem"),
+    52: _access_error("x", "mask_all"),
+    53: _access_error("x", "mask"),
+    54: _access_error("y", "mask_all"),
+    55: _access_error("y", "mask"),
+    61: "azimuth case not possible - phi_sun must be in 0 to 360 deg",
+    62: "k_max gt k_setting",
+    63: "add outside add_max ranges",
+    71: "Parameters defining A are invalid",
+    72: "Matrix A not embedded in image",
+    73: "matrix A does not have sufficient y margin",
+    74: "matrix A does not have sufficient x margin",
+}
+
+
 class FortranError(Exception):
     """Base class for errors thrown from the Fortran code used in this module."""
 
@@ -119,12 +179,13 @@ class FortranError(Exception):
         self.function_name = function_name
         self.code = code
         self.msg = msg or "Unknown error"
+        super().__init__(
+            f"Error in Fortran code {function_name} (code {code}): {self.msg}"
+        )
 
     def __str__(self):
         """Return a string representation of this Error."""
-        err = "Error in Fotran code {0} (code {1}): {2}"
-        err = err.format(self.function_name, self.code, self.msg)
-        return err
+        return self.args[0]
 
 
 class CastShadowError(FortranError):
@@ -137,102 +198,10 @@ class CastShadowError(FortranError):
 
     @staticmethod
     def get_error_message(code):
-        """Generate an error message for a specific code. It is OK for this have
-        non-returning control paths, as this will result in ``None``, which
-        is handled in the super class.
+        """Generate an error message for a specific code. Unknown codes
+        result in ``None``, which is handled in the super class.
         """
-
-        def tmpt(d, n):
-            """Generate message."""
-            err = f"attempt to access invalid {d} of {n}"
-            return err
-
-        if code == 20:
-            return tmpt("x", "dem")
-        if code == 21:
-            return tmpt("x", "dem_data")
-        if code == 22:
-            return tmpt("x", "solar and sazi")
-        if code == 23:
-            return tmpt("x", "solar_data")
-        if code == 24:
-            return tmpt("x", "a")
-        if code == 25:
-            return tmpt("y", "dem_data")
-        if code == 26:
-            return tmpt("y", "a")
-        if code == 27:
-            return tmpt("x", "mask_all")
-        if code == 28:
-            return tmpt("y", "mask_all")
-        if code == 29:
-            return tmpt("x", "mask")
-        if code == 30:
-            return tmpt("y", "mask")
-        if code == 31:
-            return tmpt("X", "dem and a")
-        if code == 32:
-            return tmpt("y", "a")
-        if code == 33:
-            return tmpt("y", "dem")
-        if code == 34:
-            return tmpt("x", "mask_all")
-        if code == 35:
-            return tmpt("x", "mask")
-        if code == 36:
-            return tmpt("y", "mask_all")
-        if code == 37:
-            return tmpt("y", "mask")
-        if code == 38:
-            return tmpt("x", "dem")
-        if code == 39:
-            return tmpt("x", "dem_data")
-        if code == 40:
-            return tmpt("x", "solar")
-        if code == 41:
-            return tmpt("x", "solar_data")
-        if code == 42:
-            return tmpt("x", "a and dem")
-        if code == 43:
-            return tmpt("y", "a")
-        if code == 44:
-            return tmpt("y", "dem")
-        if code == 45:
-            return tmpt("x", "mask_all")
-        if code == 46:
-            return tmpt("x", "mask")
-        if code == 47:
-            return tmpt("y", "mask_alll")
-        if code == 48:
-            return tmpt("y", "mask")
-        if code == 49:
-            return tmpt("x", "a and dem")
-        if code == 50:
-            return tmpt("y", "a")
-        if code == 51:
-            return tmpt("y", "dem")
-        if code == 52:
-            return tmpt("x", "mask_all")
-        if code == 53:
-            return tmpt("x", "mask")
-        if code == 54:
-            return tmpt("y", "mask_all")
-        if code == 55:
-            return tmpt("y", "mask")
-        if code == 61:
-            return "azimuth case not possible - phi_sun must be in 0 to 360 deg"
-        if code == 62:
-            return "k_max gt k_setting"
-        if code == 63:
-            return "add outside add_max ranges"
-        if code == 71:
-            return "Parameters defining A are invalid"
-        if code == 72:
-            return "Matrix A not embedded in image"
-        if code == 73:
-            return "matrix A does not have sufficient y margin"
-        if code == 74:
-            return "matrix A does not have sufficient x margin"
+        return _CAST_SHADOW_MESSAGES.get(code)
 
 
 def cast_shadow_main(
@@ -250,7 +219,37 @@ def cast_shadow_main(
     mask_all,
 ):
     # some names are from the Fortran code and so does not follow Python conventions
-    nrow, ncol = solar_data.shape
+    _cast_shadow_blocks(
+        dem_data,
+        [(solar_data, sazi_data, mask_all)],
+        dresx,
+        dresy,
+        aoff_x1,
+        aoff_x2,
+        aoff_y1,
+        aoff_y2,
+        nla_ori,
+        nsa_ori,
+    )
+
+
+def _cast_shadow_blocks(
+    dem_data,
+    sources,
+    dresx,
+    dresy,
+    aoff_x1,
+    aoff_x2,
+    aoff_y1,
+    aoff_y2,
+    nla_ori,
+    nsa_ori,
+):
+    """Evaluate the cast shadow mask for each of the (zenith, azimuth,
+    mask) `sources` a block of rows at a time, reading each buffered
+    block of the DEM only once regardless of the number of sources.
+    """
+    nrow, ncol = sources[0][0].shape
     nl, ns = dem_data.shape
 
     # the DEM data should have the same dimensions as the angle data
@@ -265,28 +264,66 @@ def cast_shadow_main(
         nla = y_idx.stop - y_idx.start
         mmax_sub = aoff_y1 + nla + aoff_y2
 
-        solar = solar_data[y_idx, :]
-        sazi = sazi_data[y_idx, :]
         dem = dem_data[y_idx.start : (y_idx.start + mmax_sub), :]
 
-        ierr, mask = cast_shadow_prim(
-            dem,
-            solar,
-            sazi,
-            dresx,
-            dresy,
-            aoff_x1,
-            aoff_x2,
-            aoff_y1,
-            aoff_y2,
-            nla_ori,
-            nsa_ori,
-        )
+        for solar_data, sazi_data, mask_all in sources:
+            solar = solar_data[y_idx, :]
+            sazi = sazi_data[y_idx, :]
+
+            ierr, mask = cast_shadow_prim(
+                dem,
+                solar,
+                sazi,
+                dresx,
+                dresy,
+                aoff_x1,
+                aoff_x2,
+                aoff_y1,
+                aoff_y2,
+                nla_ori,
+                nsa_ori,
+            )
+
+            if ierr:
+                raise CastShadowError(ierr)
+
+            mask_all[y_idx, :] = mask
+
+
+def _create_cast_shadow_dataset(
+    geobox, satellite_solar_group, zenith_name, source_dir, out_group, kwargs
+):
+    """Create (and describe) the output cast shadow dataset for a given
+    source direction.
+    """
+    zenith_angle = satellite_solar_group[zenith_name]
+
+    if GroupName.SHADOW_GROUP.value not in out_group:
+        out_group.create_group(GroupName.SHADOW_GROUP.value)
+
+    grp = out_group[GroupName.SHADOW_GROUP.value]
+
+    dname_fmt = DatasetName.CAST_SHADOW_FMT.value
+    out_dset = grp.create_dataset(
+        dname_fmt.format(source=source_dir),
+        shape=zenith_angle.shape,
+        **kwargs,
+    )
 
-        if ierr:
-            raise CastShadowError(ierr)
+    # attach some attributes to the image datasets
+    attrs = {
+        "crs_wkt": geobox.crs.ExportToWkt(),
+        "geotransform": geobox.transform.to_gdal(),
+    }
+    desc = (
+        f"The cast shadow mask determined using the {source_dir} "
+        "as the source direction."
+    )
+    attrs["description"] = desc
+    attrs["alias"] = f"cast-shadow-{source_dir}".lower()
+    attach_image_attributes(out_dset, attrs)
 
-        mask_all[y_idx, :] = mask
+    return out_dset
 
 
 def calculate_cast_shadow(
@@ -387,6 +424,127 @@ def calculate_cast_shadow(
         The Fortran code cannot be compiled with ``-O3`` as it
         produces incorrect results if it is.
     """
+    if solar_source:
+        sources = [
+            (DatasetName.SOLAR_ZENITH.value, DatasetName.SOLAR_AZIMUTH.value, "SUN")
+        ]
+    else:
+        sources = [
+            (
+                DatasetName.SATELLITE_VIEW.value,
+                DatasetName.SATELLITE_AZIMUTH.value,
+                "SATELLITE",
+            )
+        ]
+
+    _calculate_cast_shadows(
+        acquisition,
+        dsm_group,
+        satellite_solar_group,
+        buffer_distance,
+        sources,
+        out_group,
+        compression,
+        filter_opts,
+    )
+
+
+def calculate_cast_shadows(
+    acquisition,
+    dsm_group,
+    satellite_solar_group,
+    buffer_distance,
+    out_group=None,
+    compression=H5CompressionFilter.LZF,
+    filter_opts=None,
+):
+    """Calculates the cast shadow masks for both the sun and the
+    satellite as source directions in a single pass over the DSM.
+
+    The output is identical to calling :py:func:`calculate_cast_shadow`
+    once with `solar_source=True` and once with `solar_source=False`,
+    however each buffered block of the DSM is read only once and is
+    shared by both line of sight evaluations.
+
+    :param acquisition:
+        An instance of an acquisition object.
+
+    :param dsm_group:
+        The root HDF5 `Group` that contains the Digital Surface Model
+        data.
+        The dataset pathnames are given by:
+
+        * DatasetName.DSM_SMOOTHED
+
+    :param satellite_solar_group:
+        The root HDF5 `Group` that contains the satellite and solar
+        datasets specified by the pathnames given by:
+
+        * DatasetName.SOLAR_ZENITH
+        * DatasetName.SOLAR_AZIMUTH
+        * DatasetName.SATELLITE_VIEW
+        * DatasetName.SATELLITE_AZIMUTH
+
+    :param buffer_distance:
+        A number representing the desired distance (in the same
+        units as the acquisition) in which to calculate the extra
+        number of pixels required to buffer an image.
+
+    :param out_group:
+        A writeable HDF5 `Group` object.
+
+        The dataset names will be given by the format string detailed
+        by:
+
+        * DatasetName.CAST_SHADOW_FMT
+
+    :param compression:
+        The compression filter to use. Default is H5CompressionFilter.LZF.
+
+    :param filter_opts:
+        A dict of key value pairs available to the given configuration
+        instance of H5CompressionFilter. For example
+        H5CompressionFilter.LZF has the keywords *chunks* and *shuffle*
+        available.
+        Default is None, which will use the default settings for the
+        chosen H5CompressionFilter instance.
+    """
+    sources = [
+        (DatasetName.SOLAR_ZENITH.value, DatasetName.SOLAR_AZIMUTH.value, "SUN"),
+        (
+            DatasetName.SATELLITE_VIEW.value,
+            DatasetName.SATELLITE_AZIMUTH.value,
+            "SATELLITE",
+        ),
+    ]
+
+    _calculate_cast_shadows(
+        acquisition,
+        dsm_group,
+        satellite_solar_group,
+        buffer_distance,
+        sources,
+        out_group,
+        compression,
+        filter_opts,
+    )
+
+
+def _calculate_cast_shadows(
+    acquisition,
+    dsm_group,
+    satellite_solar_group,
+    buffer_distance,
+    sources,
+    out_group,
+    compression,
+    filter_opts,
+):
+    """Shared implementation of :py:func:`calculate_cast_shadow` and
+    :py:func:`calculate_cast_shadows`.
+    `sources` is a list of (zenith name, azimuth name, source direction)
+    tuples.
+    """
     # Setup the geobox
     geobox = acquisition.gridded_geo_box()
     x_res, y_res = geobox.pixelsize
@@ -394,15 +552,6 @@ def calculate_cast_shadow(
     # Define Top, Bottom, Left, Right pixel buffer margins
     margins = pixel_buffer(acquisition, buffer_distance)
 
-    if solar_source:
-        zenith_name = DatasetName.SOLAR_ZENITH.value
-        azimuth_name = DatasetName.SOLAR_AZIMUTH.value
-    else:
-        zenith_name = DatasetName.SATELLITE_VIEW.value
-        azimuth_name = DatasetName.SATELLITE_AZIMUTH.value
-
-    zenith_angle = satellite_solar_group[zenith_name]
-    azimuth_angle = satellite_solar_group[azimuth_name]
     elevation = dsm_group[DatasetName.DSM_SMOOTHED.value]
 
     # block height and width of the window/sub-matrix used in the cast
@@ -410,44 +559,29 @@ def calculate_cast_shadow(
     block_width = margins.left + margins.right
     block_height = margins.top + margins.bottom
 
-    source_dir = "SUN" if solar_source else "SATELLITE"
-
     assert out_group is not None
-    fid = out_group
 
-    if GroupName.SHADOW_GROUP.value not in fid:
-        fid.create_group(GroupName.SHADOW_GROUP.value)
-
-    grp = fid[GroupName.SHADOW_GROUP.value]
-    tile_size = satellite_solar_group[zenith_name].chunks
+    tile_size = satellite_solar_group[sources[0][0]].chunks
     kwargs = compression.settings(filter_opts, chunks=tile_size)
     kwargs["dtype"] = "bool"
 
-    dname_fmt = DatasetName.CAST_SHADOW_FMT.value
-    out_dset = grp.create_dataset(
-        dname_fmt.format(source=source_dir),
-        shape=zenith_angle.shape,
-        **kwargs,
-    )
-
-    # attach some attributes to the image datasets
-    attrs = {
-        "crs_wkt": geobox.crs.ExportToWkt(),
-        "geotransform": geobox.transform.to_gdal(),
-    }
-    desc = (
-        f"The cast shadow mask determined using the {source_dir} "
-        "as the source direction."
-    )
-    attrs["description"] = desc
-    attrs["alias"] = f"cast-shadow-{source_dir}".lower()
-    attach_image_attributes(out_dset, attrs)
+    blocks = []
+    for zenith_name, azimuth_name, source_dir in sources:
+        out_dset = _create_cast_shadow_dataset(
+            geobox, satellite_solar_group, zenith_name, source_dir, out_group, kwargs
+        )
+        blocks.append(
+            (
+                satellite_solar_group[zenith_name],
+                satellite_solar_group[azimuth_name],
+                out_dset,
+            )
+        )
 
-    # Compute the cast shadow mask
-    cast_shadow_main(
+    # Compute the cast shadow mask(s)
+    _cast_shadow_blocks(
         elevation,
-        zenith_angle,
-        azimuth_angle,
+        blocks,
         x_res,
         y_res,
         margins.left,
@@ -456,7 +590,6 @@ def calculate_cast_shadow(
         margins.bottom,
         block_height,
         block_width,
-        out_dset,
     )
 
 